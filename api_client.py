@@ -1,20 +1,101 @@
 import requests
-from typing import List, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Optional, Iterator
+import hashlib
+import json
 import logging
+import threading
+import time
 from config import AppConfig
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Keep-alive sockets held per host. Concurrent calls beyond this would open
+# extra connections that urllib3 discards afterwards, paying a fresh TLS
+# handshake on every round, so generate_many never runs wider than the pool.
+POOL_MAXSIZE = 8
+
+class ResponseCache:
+    """In-memory LRU cache of completions with a per-entry TTL."""
+
+    def __init__(self, max_size: int = 128, default_ttl: float = 300):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()  # generate_many calls in from worker threads
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict]) -> str:
+        payload = json.dumps(messages, sort_keys=True, separators=(",", ":"))
+        return hashlib.md5((model + "|" + payload).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, response_text = entry
+            if time.monotonic() - stored_at > self.default_ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response_text
+
+    def set(self, key: str, response_text: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response_text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
 class AIClient:
     def __init__(self, config: AppConfig):
         self.config = config
+        self.cache = ResponseCache()
 
-    def generate_response(self, messages: List[Dict], model: str) -> str:
-        headers = {
-            "Authorization": f"Bearer {self.config.api_key}",
+        # One pooled session per client so every turn reuses the same
+        # keep-alive connection instead of a fresh TCP + TLS handshake.
+        self.session = requests.Session()
+        # requests' defaults already send keep-alive and gzip/deflate (plus br
+        # when brotli is installed), so only the API headers are added here.
+        self.session.headers.update({
+            "Authorization": f"Bearer {config.api_key}",
             "Content-Type": "application/json"
-        }
+        })
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=POOL_MAXSIZE,
+            # urllib3 backs off 0.5s -> 1s -> 2s on connection errors and
+            # 429/5xx, honouring Retry-After. POST is not retried by default,
+            # so allow it explicitly: completions are idempotent here. Read
+            # errors are not retried: the request already reached the model,
+            # so a resend re-bills it and a read timeout would repeat in full.
+            max_retries=Retry(
+                total=3,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["POST"],
+                respect_retry_after_header=True
+            )
+        )
+        self.session.mount("https://", adapter)
+
+    def generate_response(self, messages: List[Dict], model: str) -> str:
+        cache_key = ResponseCache.make_key(model, messages)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Cache HIT for model %s", model)
+            return cached
+        logger.debug("Cache MISS for model %s", model)
 
         data = {
             "model": model,
@@ -23,36 +104,120 @@ class AIClient:
             "temperature": self.config.temperature
         }
 
+        response = None
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.config.api_base,
-                headers=headers,
-                json=data
+                json=data,
+                timeout=(self.config.connect_timeout, self.config.read_timeout)
             )
             response.raise_for_status()  # This is good, keep it!
 
             # Check for empty responses *before* accessing ['choices']
             response_json = response.json()
-            if not response_json.get('choices'):
-                logger.warning(f"API returned an empty 'choices' array.  Full response: {response_json}")
+            choices = response_json.get('choices')
+            if not choices:
+                logger.warning("API returned an empty 'choices' array.  Full response: %s", response_json)
                 return "The AI model returned an empty response."
 
-            if not response_json['choices'][0]['message']['content'].strip():
-                logger.warning(f"API returned an empty message content. Full response: {response_json}")
+            content = choices[0]['message']['content']
+            if not content.strip():
+                logger.warning("API returned an empty message content. Full response: %s", response_json)
                 return "The AI model returned an empty response."
 
-            return response_json['choices'][0]['message']['content']
+            self.cache.set(cache_key, content)  # Only successful completions are cached
+            return content
 
         except requests.exceptions.RequestException as e:  # More specific exception
-            logger.error(f"Request Exception: {e}")
-            if 'response' in locals() and response: # Check if response exists
-                logger.error(f"Response Status Code: {response.status_code}")
-                logger.error(f"Response Text: {response.text}")
+            logger.error("Request Exception: %s", e)
+            if response is not None:
+                logger.error("Response Status Code: %s", response.status_code)
+                logger.error("Response body (truncated): %s", response.content[:512])
             return f"Error generating response: {e}"
 
         except Exception as e: #Catch any other error
-            logger.error(f"An unexpected error occurred: {e}")
-            if 'response' in locals() and response:
-                logger.error(f"Response Status Code: {response.status_code}")
-                logger.error(f"Response Text: {response.text}")
-            return f"Error generating response: {e}"
\ No newline at end of file
+            logger.error("An unexpected error occurred: %s", e)
+            if response is not None:
+                logger.error("Response Status Code: %s", response.status_code)
+                logger.error("Response body (truncated): %s", response.content[:512])
+            return f"Error generating response: {e}"
+
+    def generate_response_stream(self, messages: List[Dict], model: str) -> Iterator[str]:
+        """Yield the completion as it is generated, via server-sent events."""
+        cache_key = ResponseCache.make_key(model, messages)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Cache HIT for model %s", model)
+            yield cached
+            return
+        logger.debug("Cache MISS for model %s", model)
+
+        data = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "stream": True
+        }
+
+        chunks = []
+        try:
+            with self.session.post(
+                self.config.api_base,
+                json=data,
+                timeout=(self.config.connect_timeout, self.config.read_timeout),
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line.startswith(b"data: "):
+                        continue  # Keep-alive blank lines and SSE comments
+                    payload = line[6:]
+                    if payload == b"[DONE]":
+                        break
+                    choices = json.loads(payload).get('choices')
+                    if not choices:
+                        continue
+                    token = choices[0].get('delta', {}).get('content')
+                    if token:
+                        chunks.append(token)
+                        yield token
+
+        # Once tokens have gone out the caller already holds part of the reply;
+        # end the stream there rather than appending an error message to it.
+        except requests.exceptions.RequestException as e:
+            logger.error("Request Exception while streaming: %s", e)
+            if not chunks:
+                yield f"Error generating response: {e}"
+            return
+
+        except Exception as e:
+            logger.error("An unexpected error occurred while streaming: %s", e)
+            if not chunks:
+                yield f"Error generating response: {e}"
+            return
+
+        content = "".join(chunks)
+        if not content.strip():
+            logger.warning("API streamed an empty message content.")
+            yield "The AI model returned an empty response."
+            return
+        self.cache.set(cache_key, content)  # Only successful completions are cached
+
+    def generate_many(self, calls: List[Tuple[List[Dict], str]]) -> List[str]:
+        """Run several (messages, model) requests concurrently, preserving order."""
+        if len(calls) <= 1:
+            return [self.generate_response(messages, model) for messages, model in calls]
+
+        # The calls are independent and network-bound, so threads sharing the
+        # pooled session overlap the round trips without blocking on the GIL.
+        with ThreadPoolExecutor(max_workers=min(len(calls), POOL_MAXSIZE)) as executor:
+            futures = [
+                executor.submit(self.generate_response, messages, model)
+                for messages, model in calls
+            ]
+            return [future.result() for future in futures]
+
+    def generate_batch(self, messages: List[Dict], models: List[str]) -> List[str]:
+        """Ask several models the same conversation concurrently, in model order."""
+        return self.generate_many([(messages, model) for model in models])
@@ -1,12 +1,46 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Tuple
-from enum import Enum
+from typing import List, Dict, Optional, Any, Tuple, Iterator, Deque
+from enum import Enum, StrEnum
+from functools import lru_cache
+import math
+from bisect import bisect_left, bisect_right
 import random
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, deque
 from config import AppConfig, AgentConfig 
 
+# Samples reserved per agent before the analytics buffers double in size
+_INITIAL_CAPACITY = 32
+
+# Confidence thresholds (ascending) and the argument openers used from each one up
+_STRENGTH_THRESHOLDS = (0.4, 0.6, 0.8)
+_STRENGTH_MODIFIERS = (
+    ("One could argue", "It appears that", "Consider that"),
+    ("Evidence suggests", "Research shows", "Studies indicate"),
+    ("Clearly", "Obviously", "Without doubt"),
+)
+
+# A "sentence" worth keeping: at least 20 characters up to its terminator
+_SENT_RE = re.compile(r'[^.!?]{20,}?[.!?]')
+
+# Placeholder argument generators. Agents share beliefs' wording, so identical
+# beliefs get the same (immutable) tuples back instead of fresh lists.
+@lru_cache(maxsize=1024)
+def _premises(belief: str) -> Tuple[str, ...]:
+    return (f"Support for {belief}", f"Evidence for {belief}")
+
+@lru_cache(maxsize=1024)
+def _evidence(belief: str) -> Tuple[str, ...]:
+    return (f"Evidence A for {belief}", f"Evidence B for {belief}")
+
+@lru_cache(maxsize=1024)
+def _fallbacks(belief: str) -> Tuple[str, ...]:
+    return (f"Fallback 1 for {belief}", f"Fallback 2 for {belief}")
+
 # Base classes from original implementation
 class DebateStatus(Enum):
     NOT_STARTED = "not_started"
@@ -14,12 +48,12 @@ class DebateStatus(Enum):
     CONCLUDED = "concluded"
     ERROR = "error"
 
-class StanceType(Enum):
+class StanceType(StrEnum):
     LEFT = "left"
     RIGHT = "right"
     NEUTRAL = "neutral"
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     role: str
     content: str
@@ -34,7 +68,7 @@ class Message:
             "content": self.content,
             "model": self.model,
             "timestamp": self.timestamp,
-            "stance": self.stance.value if self.stance else None,
+            "stance": self.stance,  # StrEnum, so already JSON-ready
             "metadata": self.metadata
         }
     
@@ -70,61 +104,116 @@ class DebateMetrics:
         }
 
 # Enhanced components
-class EmotionalState(Enum):
+class EmotionalState(StrEnum):
     CALM = "calm"
     AGITATED = "agitated"
     PASSIONATE = "passionate"
     DEFENSIVE = "defensive"
     AGGRESSIVE = "aggressive"
 
-class DebatePhase(Enum):
+_EMOTIONAL_STATES = tuple(EmotionalState)
+
+class DebatePhase(StrEnum):
     OPENING = "opening"
     EXPLORATION = "exploration"
     CONFRONTATION = "confrontation"
     RESOLUTION = "resolution"
     REFLECTION = "reflection"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PersonalityDynamics:
     base_emotional_state: EmotionalState
     trigger_sensitivity: float  # 0-1: how easily triggered by opposing views
     adaptation_rate: float     # 0-1: how quickly agent adapts its strategy
     confidence_level: float    # 0-1: impacts argument strength
     learning_coefficient: float # 0-1: ability to learn from debate history
+    trigger_phrases: Tuple[str, ...] = ()  # Lowercased once, at construction
 
-    def calculate_emotional_impact(self, message_content: str, trigger_words: List[str]) -> float:
+    def calculate_emotional_impact(self, message_content: str) -> float:
         """Calculate emotional impact of a message based on trigger words and sensitivity"""
-        trigger_count = sum(word in message_content.lower() for word in trigger_words)
+        content = message_content.lower()
+        trigger_count = sum(1 for phrase in self.trigger_phrases if phrase in content)
         return min(1.0, trigger_count * self.trigger_sensitivity)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ArgumentStructure:
-    premises: List[str]
+    premises: Tuple[str, ...]
     conclusion: str
-    supporting_evidence: List[str]
+    supporting_evidence: Tuple[str, ...]
     counter_arguments: List[str]
-    fallback_positions: List[str]
+    fallback_positions: Tuple[str, ...]
     
     def strengthen_argument(self, confidence: float) -> str:
         """Generate stronger version of argument based on confidence"""
-        strength_modifiers = {
-            0.8: ["Clearly", "Obviously", "Without doubt"],
-            0.6: ["Evidence suggests", "Research shows", "Studies indicate"],
-            0.4: ["One could argue", "It appears that", "Consider that"]
-        }
-        
-        confidence_tier = max(k for k in strength_modifiers.keys() if confidence >= k)
-        modifier = random.choice(strength_modifiers[confidence_tier])
+        # Confidence below the lowest threshold still uses the most hedged tier
+        confidence_tier = max(0, bisect_right(_STRENGTH_THRESHOLDS, confidence) - 1)
+        modifier = random.choice(_STRENGTH_MODIFIERS[confidence_tier])
         
         return f"{modifier}, {self.conclusion} because {random.choice(self.premises)}."
 
 class DebateAnalytics:
-    def __init__(self):
-        self.argument_effectiveness = defaultdict(list)  # Track effectiveness of different arguments
-        self.emotional_trajectories = defaultdict(list)  # Track emotional states over time
+    def __init__(self, agent_names: Tuple[str, ...]):
+        self._agent_idx = {name: i for i, name in enumerate(agent_names)}
+        # Effectiveness of each argument made, laid out like the emotional states below
+        self._arg_buf = np.zeros((len(agent_names), _INITIAL_CAPACITY), dtype=np.float64)
+        self._arg_len = np.zeros(len(agent_names), dtype=np.int32)
+        # Emotional states over time: one contiguous float32 row per agent
+        self._emo_buf = np.zeros((len(agent_names), _INITIAL_CAPACITY), dtype=np.float32)
+        self._emo_len = np.zeros(len(agent_names), dtype=np.int32)
         self.strategy_adaptations = defaultdict(list)   # Track how strategies evolve
         self.interaction_patterns = defaultdict(int)    # Track patterns in debate flow
+        # Running (Welford) mean/variance of emotional states, so volatility is O(1)
+        self._emo_n = 0
+        self._emo_mean = 0.0
+        self._emo_M2 = 0.0
+
+    def record_argument_effectiveness(self, agent_name: str, value: float):
+        """Add one argument-effectiveness score to the agent's history"""
+        i = self._agent_idx[agent_name]
+        j = self._arg_len[i]
+        if j == self._arg_buf.shape[1]:
+            self._arg_buf = np.concatenate([self._arg_buf, np.zeros_like(self._arg_buf)], axis=1)
+        self._arg_buf[i, j] = value
+        self._arg_len[i] += 1
+
+    @property
+    def argument_effectiveness(self) -> Dict[str, List[float]]:
+        """Plain-list copies of each agent's scores, oldest first"""
+        return {
+            name: self._arg_buf[i, :self._arg_len[i]].tolist()
+            for name, i in self._agent_idx.items()
+        }
+
+    def argument_count(self, agent_name: str) -> int:
+        """Number of scores recorded for the agent, without copying them"""
+        return int(self._arg_len[self._agent_idx[agent_name]])
+
+    def record_emotional_state(self, agent_name: str, value: float):
+        """Add one emotional-state sample to the agent's trajectory and the running stats"""
+        i = self._agent_idx[agent_name]
+        j = self._emo_len[i]
+        if j == self._emo_buf.shape[1]:
+            # Amortized O(1) append: double the capacity for every agent at once
+            self._emo_buf = np.concatenate([self._emo_buf, np.zeros_like(self._emo_buf)], axis=1)
+        self._emo_buf[i, j] = value
+        self._emo_len[i] += 1
+
+        n = self._emo_n + 1
+        delta = value - self._emo_mean
+        self._emo_mean += delta / n
+        self._emo_M2 += delta * (value - self._emo_mean)
+        self._emo_n = n
         
+    def _emotional_trajectory(self, agent_name: str) -> np.ndarray:
+        """View of the agent's recorded emotional states, oldest first"""
+        i = self._agent_idx[agent_name]
+        return self._emo_buf[i, :self._emo_len[i]]
+
+    @property
+    def emotional_trajectories(self) -> Dict[str, List[float]]:
+        """Plain-list copies per agent; the buffer itself stays internal"""
+        return {name: self._emotional_trajectory(name).tolist() for name in self._agent_idx}
+
     def analyze_debate_dynamics(self, messages: List[Message]) -> Dict[str, Any]:
         """Analyze debate patterns and dynamics"""
         return {
@@ -135,9 +224,8 @@ class DebateAnalytics:
         }
     
     def _calculate_emotional_volatility(self, messages: List[Message]) -> float:
-        """Calculate emotional state changes over time"""
-        emotional_states = [msg.metadata.get("emotional_state", 0.5) for msg in messages]
-        return np.std(emotional_states) if emotional_states else 0.0
+        """Calculate emotional state changes over time (population std of recorded states)"""
+        return math.sqrt(self._emo_M2 / self._emo_n) if self._emo_n else 0.0
     
     def _measure_argument_coherence(self, messages: List[Message]) -> float:
         """Measure how well arguments flow and connect"""
@@ -160,34 +248,107 @@ class DebateEngine:
     def __init__(self, config: AppConfig, client: "AIClient"):
         self.config = config
         self.client = client
-        self.conversation: List[Message] = []
+        # Bounded when config.max_history is set; the API payloads are kept separately
+        self.conversation: Deque[Message] = deque(maxlen=config.max_history)
         self.metrics = DebateMetrics()
         self.status = DebateStatus.NOT_STARTED
         self.current_agent_index = 0
+        self._agents_list = list(config.agents.items())  # Turn order, fixed for the debate
+        self._agent_names = tuple(name for name, _ in self._agents_list)
+        self._agent_count = len(self._agent_names)
         self.error_count = 0
         self.max_errors = 3
+        self.message_count = 0  # Non-system messages, kept so the UI needn't rescan
+        # System prompts are serialized once and always sent first, so every
+        # request starts with a byte-identical prefix the provider can cache.
+        self._prefix_payload: List[dict] = []
+        self._dialog_payload: List[dict] = []  # Grows one dict per message, never rebuilt
+        # Only the last max_turns dialog messages are sent verbatim; older ones
+        # are replaced by a summary so prompt size stays flat as the debate grows.
+        self.max_turns = 8
+        self._opening_payload: Optional[dict] = None  # The debate question, always kept
+        # (dialog index, key point) per stance, in dialog order, so the summary
+        # can take exactly the replies that have left the window
+        self.stance_summary: Dict[str, List[Tuple[int, str]]] = {stance: [] for stance in StanceType}
+        # Summaries are built off the response path; one worker keeps them in order
+        self._summary_lock = threading.Lock()
+        self._bg = ThreadPoolExecutor(max_workers=1)
         self._initialize_conversation()
 
     def _initialize_conversation(self):
         """Initialize conversation with system prompts"""
+        created = time.time()  # The prompts are created together; read the clock once
         for agent in self.config.agents.values():
-            self.conversation.append(
+            self._append_message(
                 Message(
                     role="system",
                     content=self._generate_agent_prompt(agent),
                     model=agent.model,
+                    timestamp=created,
                     stance=StanceType(agent.stance),
                     metadata={"agent_name": agent.name},
                 )
             )
 
+    def _append_message(self, message: Message):
+        """Append a message to the conversation and keep the counters in sync"""
+        self.conversation.append(message)
+        if message.role == "system":
+            self._prefix_payload.append(self._api_payload(message))
+        else:
+            payload = self._api_payload(message)
+            if message.role == "user" and self._opening_payload is None:
+                self._opening_payload = payload
+            self._dialog_payload.append(payload)
+            self.message_count += 1
+
+    @staticmethod
+    def _api_payload(message: Message) -> dict:
+        """Chat-completions message; the model is chosen at the top level of the request"""
+        return {"role": message.role, "content": message.content}
+
+    def _build_api_messages(self) -> List[dict]:
+        """Stable system prefix followed by the debate so far, windowed to max_turns"""
+        if len(self._dialog_payload) <= self.max_turns:
+            return self._prefix_payload + self._dialog_payload
+
+        window_start = len(self._dialog_payload) - self.max_turns
+        head = [self._opening_payload] if self._opening_payload is not None else []
+        summary = self._summary_payload(window_start)
+        if summary is not None:
+            head.append(summary)
+        return self._prefix_payload + head + self._dialog_payload[window_start:]
+
+    def _summary_payload(self, window_start: int) -> Optional[dict]:
+        """System message standing in for the turns that fell out of the window"""
+        with self._summary_lock:
+            dropped = []
+            for points in (self.stance_summary[StanceType.LEFT], self.stance_summary[StanceType.RIGHT]):
+                # Latest key points of this stance from before the window
+                end = bisect_left(points, (window_start,))
+                dropped.extend(points[max(0, end - 3):end])
+        if not dropped:
+            return None
+        # Back into dialog order; stable, so a reply's own points keep their order
+        dropped.sort(key=lambda point: point[0])
+        return {
+            "role": "system",
+            "content": "Prior debate summary: " + "; ".join(point for _, point in dropped)
+        }
+
+    def _summarize_stance(self, message: Message, dialog_index: int):
+        """Keep the first few substantial sentences of a reply as its key points"""
+        key_points = [(dialog_index, s.strip()) for s in _SENT_RE.findall(message.content)[:3]]
+        with self._summary_lock:
+            self.stance_summary[message.stance].extend(key_points)
+
     def _generate_agent_prompt(self, agent) -> str:
         """Generate agent-specific prompt"""
-        return f"You are {agent.name} with {agent.stance} stance."
+        return agent.init_prompt
 
     def add_user_message(self, message_content: str):
         """Adds a user message to the conversation history."""
-        self.conversation.append(
+        self._append_message(
             Message(role="user", content=message_content, model="", stance=None)
         )
         
@@ -198,42 +359,94 @@ class DebateEngine:
             "content": message.content,
             "model": message.model,
             "timestamp": message.timestamp,
-            "stance": message.stance.value if isinstance(message.stance, StanceType) else message.stance,
+            "stance": message.stance,
             "metadata": message.metadata
         }
 
     def _select_next_agent(self):
         """simple turn-based agent selection"""
-        agent_names = list(self.config.agents.keys())
-        next_agent_index = self.current_agent_index % len(agent_names)
+        agent_name = self._agent_names[self.current_agent_index % self._agent_count]
         self.current_agent_index += 1
-        return agent_names[next_agent_index]
+        return agent_name
+
+    def peek_next_agent(self) -> str:
+        """Name of the agent that will speak on the next turn"""
+        return self._agent_names[self.current_agent_index % self._agent_count]
+
+    def _record_response(self, agent_name: str, response: str):
+        """Append an agent's reply to the conversation"""
+        agent = self.config.agents[agent_name]
+        message = Message(
+            role="assistant",
+            content=response,
+            model=agent.model,
+            stance=StanceType(agent.stance),
+            metadata={"agent_name": agent_name}
+        )
+        self._append_message(message)
+        self._bg.submit(self._summarize_stance, message, len(self._dialog_payload) - 1)
 
     def generate_responses(self, num_turns: int = 1) -> List[str]:
-        """Basic response generation -- overridden by EnhancedDebateEngine"""
+        """Basic response generation -- overridden by EnhancedDebateEngine
+
+        With config.parallel_agents each turn is a full round in which every
+        agent answers the same snapshot concurrently (see generate_round).
+        """
         responses = []
 
+        if self.config.parallel_agents:
+            for _ in range(num_turns):
+                responses.extend(self.generate_round())
+            return responses
+
+        agents = self.config.agents
         for _ in range(num_turns):
             agent_name = self._select_next_agent()
-            # Use the new serialization method
-            messages = [self._serialize_message(m) for m in self.conversation]
+            messages = self._build_api_messages()
             
-            response = self.client.generate_response(
-                messages, self.config.agents[agent_name].model
-            )
+            response = self.client.generate_response(messages, agents[agent_name].model)
             
-            self.conversation.append(
-                Message(
-                    role="assistant",
-                    content=response,
-                    model=self.config.agents[agent_name].model,
-                    stance=StanceType(self.config.agents[agent_name].stance),
-                    metadata={"agent_name": agent_name}
-                )
-            )
+            self._record_response(agent_name, response)
             responses.append(response)
         return responses
 
+    def generate_round(self) -> List[str]:
+        """Have every agent answer the same conversation concurrently"""
+        messages = self._build_api_messages()
+
+        # Wall-clock cost is the slowest agent rather than the sum of all of them
+        responses = self.client.generate_batch(
+            messages, [agent.model for _, agent in self._agents_list]
+        )
+
+        # Record in agent order so the transcript is deterministic
+        for (agent_name, _), response in zip(self._agents_list, responses):
+            self._record_response(agent_name, response)
+        return responses
+
+    def stream_next_turn(self) -> Iterator[str]:
+        """Stream the next agent's reply as it is generated, then record it
+
+        The turn only advances once a reply is recorded. If the consumer
+        closes the stream early (e.g. a Streamlit rerun), whatever arrived so
+        far is kept as the reply; if nothing did, the turn is left to retry.
+        """
+        agent_name = self.peek_next_agent()
+        messages = self._build_api_messages()
+
+        model = self.config.agents[agent_name].model
+        chunks = []
+        stream = self.client.generate_response_stream(messages, model)
+        try:
+            for token in stream:
+                chunks.append(token)
+                yield token
+        finally:
+            stream.close()
+            if chunks:
+                self._select_next_agent()
+                self._record_response(agent_name, "".join(chunks))
+
     def get_debate_summary(self) -> str:
         """Placeholder for generating a debate summary."""
         return "Debate summary not yet implemented."
@@ -258,17 +471,17 @@ class DebateEngine:
         """Placeholder for track topic evolution"""
         return []
 
-    def _generate_premises(self, belief: str) -> List[str]:
-        """Placeholder for generate premises"""
-        return [f"Premise supporting {belief}"]
+    def _generate_premises(self, belief: str) -> Tuple[str, ...]:
+        """Generate supporting premises for a belief"""
+        return _premises(belief)
 
-    def _generate_evidence(self, belief: str) -> List[str]:
-        """Placeholder for generate evidence"""
-        return [f"Evidence supporting {belief}"]
+    def _generate_evidence(self, belief: str) -> Tuple[str, ...]:
+        """Generate evidence supporting a belief"""
+        return _evidence(belief)
 
-    def _generate_fallbacks(self, belief: str) -> List[str]:
-        """Placeholder for generate fallbacks"""
-        return [f"Fallback position for {belief}"]
+    def _generate_fallbacks(self, belief: str) -> Tuple[str, ...]:
+        """Generate fallback positions for a belief"""
+        return _fallbacks(belief)
 
     def _evaluate_response_effectiveness(self, response: str) -> float:
         """Placeholder for evaluate response effectiveness"""
@@ -316,25 +529,42 @@ class DebateEngine:
         """Placeholder for generate conclusion"""
         return "Conclusion"
 
+# (responses generated, phase entered), in the order the debate moves through them
+_PHASE_SCHEDULE = (
+    (3, DebatePhase.EXPLORATION),
+    (5, DebatePhase.CONFRONTATION),
+    (8, DebatePhase.RESOLUTION),
+    (10, DebatePhase.REFLECTION),
+)
+
 class EnhancedDebateEngine(DebateEngine):
     def __init__(self, config: 'AppConfig', client: 'AIClient'):
         super().__init__(config, client)
-        self.analytics = DebateAnalytics()
+        self.analytics = DebateAnalytics(self._agent_names)
         self.current_phase = DebatePhase.OPENING
+        self._assistant_count = 0  # Responses generated so far; drives phase changes
+        self._phase_idx = 0  # Next entry of _PHASE_SCHEDULE to reach
+        # Context only changes when a message arrives or the phase moves on
+        self._ctx_cache_key: Optional[Tuple[int, DebatePhase]] = None
+        self._ctx_cache_val: Optional[Dict[str, Any]] = None
         self.personality_dynamics = self._initialize_personality_dynamics()
         self.argument_registry = self._build_argument_registry()
         
     def _initialize_personality_dynamics(self) -> Dict[str, PersonalityDynamics]:
         """Initialize personality dynamics for each agent"""
+        # Same `random` stream as the rest of the engine, so random.seed() replays a debate
         return {
             agent_name: PersonalityDynamics(
-                base_emotional_state=random.choice(list(EmotionalState)),
+                base_emotional_state=random.choice(_EMOTIONAL_STATES),
                 trigger_sensitivity=random.uniform(0.3, 0.8),
                 adaptation_rate=random.uniform(0.2, 0.6),
                 confidence_level=random.uniform(0.4, 0.9),
-                learning_coefficient=random.uniform(0.3, 0.7)
+                learning_coefficient=random.uniform(0.3, 0.7),
+                trigger_phrases=tuple(
+                    phrase.lower() for phrase in agent_config.rhetoric.trigger_phrases
+                )
             )
-            for agent_name in self.config.agents.keys()
+            for agent_name, agent_config in self._agents_list
         }
     
     def _build_argument_registry(self) -> Dict[str, List[ArgumentStructure]]:
@@ -342,12 +572,20 @@ class EnhancedDebateEngine(DebateEngine):
         registry = {}
         for agent_name, agent_config in self.config.agents.items():
             registry[agent_name] = []
+            # Lowercase each counter-argument key once, not once per belief
+            counter_keys = [
+                (key.lower(), counter_args)
+                for key, counter_args in agent_config.counter_arguments.items()
+            ]
             for belief in agent_config.core_beliefs:
                 # Find relevant counter-arguments
-                relevant_counter_args = []
-                for key in agent_config.counter_arguments:
-                    if key.lower() in belief.lower():  # Check if key is in belief
-                        relevant_counter_args.extend(agent_config.counter_arguments[key])
+                belief_lower = belief.lower()
+                relevant_counter_args = [
+                    counter_arg
+                    for key_lower, counter_args in counter_keys
+                    if key_lower in belief_lower  # Check if key is in belief
+                    for counter_arg in counter_args
+                ]
 
                 registry[agent_name].append(
                     ArgumentStructure(
@@ -360,27 +598,11 @@ class EnhancedDebateEngine(DebateEngine):
                 )
         return registry
 
-    def _generate_premises(self, belief: str) -> List[str]:
-        """Generate supporting premises for a belief"""
-        # Placeholder implementation
-        return [f"Support for {belief}", f"Evidence for {belief}"]
-
-    def _generate_evidence(self, belief: str) -> List[str]:
-        """Generate evidence supporting a belief"""
-        # Placeholder implementation
-        return [f"Evidence A for {belief}", f"Evidence B for {belief}"]
-
-    def _generate_fallbacks(self, belief: str) -> List[str]:
-        """Generate fallback positions for a belief"""
-        # Placeholder implementation
-        return [f"Fallback 1 for {belief}", f"Fallback 2 for {belief}"]
-
     def generate_responses(self, num_turns: int = 1) -> List[str]:
         """Enhanced response generation with dynamic adaptation"""
         responses = []
         for _ in range(num_turns):
-            agent_name = list(self.config.agents.keys())[self.current_agent_index]
-            agent_config = self.config.agents[agent_name]
+            agent_name, agent_config = self._agents_list[self.current_agent_index]
             personality = self.personality_dynamics[agent_name]
             
             # Analyze debate context
@@ -405,19 +627,24 @@ class EnhancedDebateEngine(DebateEngine):
             responses.append(response)
             
             # Update agent index
-            self.current_agent_index = (self.current_agent_index + 1) % len(self.config.agents)
+            self.current_agent_index = (self.current_agent_index + 1) % self._agent_count
             
         return responses
 
     def _analyze_debate_context(self) -> Dict[str, Any]:
         """Analyze current debate context for strategic planning"""
-        recent_messages = self.conversation[-3:]
-        return {
+        key = (self.message_count, self.current_phase)
+        if key == self._ctx_cache_key:
+            return self._ctx_cache_val
+
+        result = {
             "phase": self.current_phase,
             "emotional_intensity": 0.5,  # Placeholder implementation
             "argument_strength": 0.7,    # Placeholder implementation
             "topic_evolution": {"current_focus": "main_topic"}  # Placeholder
         }
+        self._ctx_cache_key, self._ctx_cache_val = key, result
+        return result
 
     def _adapt_debate_strategy(
         self,
@@ -432,11 +659,11 @@ class EnhancedDebateEngine(DebateEngine):
         # Create a default argument if none exist
         if not available_arguments:
             default_argument = ArgumentStructure(
-                premises=[f"Default premise for {agent_config.name}"],
+                premises=(f"Default premise for {agent_config.name}",),
                 conclusion=f"Default position for {agent_config.name}",
-                supporting_evidence=[],
+                supporting_evidence=(),
                 counter_arguments=[],
-                fallback_positions=[]
+                fallback_positions=()
             )
             available_arguments = [default_argument]
             # Add to registry for future use
@@ -462,39 +689,33 @@ class EnhancedDebateEngine(DebateEngine):
 
     def _update_debate_state(self, response: str, agent_name: str, personality: PersonalityDynamics):
         """Update debate state with new response"""
-        self.analytics.argument_effectiveness[agent_name].append(0.7)  # Placeholder
-        self.analytics.emotional_trajectories[agent_name].append(
-            personality.calculate_emotional_impact(response, 
-                self.config.agents[agent_name].rhetoric.trigger_phrases)
+        self.analytics.record_argument_effectiveness(agent_name, 0.7)  # Placeholder
+        self.analytics.record_emotional_state(
+            agent_name, personality.calculate_emotional_impact(response)
         )
+        self._assistant_count += 1
         self._progress_debate_phase()
 
     def _progress_debate_phase(self):
         """Progress debate through phases based on context"""
-        phase_transitions = {
-            DebatePhase.OPENING: (3, DebatePhase.EXPLORATION),
-            DebatePhase.EXPLORATION: (5, DebatePhase.CONFRONTATION),
-            DebatePhase.CONFRONTATION: (8, DebatePhase.RESOLUTION),
-            DebatePhase.RESOLUTION: (10, DebatePhase.REFLECTION)
-        }
-        
-        current_messages = len([m for m in self.conversation if m.role == "assistant"])
-        for current_phase, (threshold, next_phase) in phase_transitions.items():
-            if self.current_phase == current_phase and current_messages >= threshold:
-                self.current_phase = next_phase
-                break
+        while (
+            self._phase_idx < len(_PHASE_SCHEDULE)
+            and self._assistant_count >= _PHASE_SCHEDULE[self._phase_idx][0]
+        ):
+            self.current_phase = _PHASE_SCHEDULE[self._phase_idx][1]
+            self._phase_idx += 1
 
     def get_debate_analysis(self) -> Dict[str, Any]:
         """Get comprehensive debate analysis"""
         return {
             "dynamics": self.analytics.analyze_debate_dynamics(self.conversation),
             "agent_performances": {
-                agent: len(self.analytics.argument_effectiveness[agent])
+                agent: self.analytics.argument_count(agent)
                 for agent in self.config.agents
             },
             "debate_progression": {
                 "current_phase": self.current_phase.value,
                 "messages_count": len(self.conversation),
-                "emotional_trajectory": dict(self.analytics.emotional_trajectories)
+                "emotional_trajectory": self.analytics.emotional_trajectories
             }
         }
\ No newline at end of file